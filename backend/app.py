@@ -1,17 +1,57 @@
 """
 Flask Application Factory
 """
+import hashlib
+import threading
+
+import orjson
 from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+from flask.sessions import SecureCookieSessionInterface
 from flask_cors import CORS
 from flask_login import LoginManager
 from config import config
 
+# Blueprints and DB helpers imported once at module load; repeat
+# create_app() calls (each test module builds an app) then only pay for
+# registration, not module import
+from database.auth import init_auth_db
+from routes.auth import auth_bp
+from routes.ai import ai_bp
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson for faster encode/decode"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+class Blake2SessionInterface(SecureCookieSessionInterface):
+    """Session interface signing cookies with HMAC-BLAKE2b
 
-def create_app(config_name='development'):
+    BLAKE2b is both faster than the SHA1 default and cryptographically
+    stronger; the sign/verify pair runs on every authenticated request.
+    Changing the digest invalidates existing sessions, which only forces
+    a re-login.
+    """
+    digest_method = staticmethod(hashlib.blake2b)
+    key_derivation = 'hmac'
+
+
+def create_app(config_name='development', test_config=None):
     """Create and configure Flask application"""
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    app.session_interface = Blake2SessionInterface()
     app.config.from_object(config[config_name])
-    
+    if test_config:
+        # Apply overrides before blueprints snapshot config values
+        app.config.update(test_config)
+
     # Enable CORS with credentials support
     if app.config.get('ALLOW_ALL_ORIGINS'):
         CORS(app, origins='*', supports_credentials=True)
@@ -31,13 +71,26 @@ def create_app(config_name='development'):
     def unauthorized():
         return jsonify({'error': 'Authentication required'}), 401
     
-    # Initialize authentication database
-    from database.auth import init_auth_db
-    init_auth_db()
-    
+    # Initialize the authentication database lazily, so constructing the
+    # app (CLI commands, test collection, worker fork) doesn't open a DB
+    # connection before the first request needs one. The lock keeps
+    # concurrent first requests under a threaded server from racing past
+    # a not-yet-finished init, and the flag flips only on success so a
+    # failed init is retried rather than swallowed.
+    db_initialized = False
+    db_init_lock = threading.Lock()
+
+    @app.before_request
+    def _ensure_auth_db():
+        nonlocal db_initialized
+        if db_initialized:
+            return
+        with db_init_lock:
+            if not db_initialized:
+                init_auth_db()
+                db_initialized = True
+
     # Register blueprints
-    from routes.auth import auth_bp
-    from routes.ai import ai_bp
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(ai_bp, url_prefix='/api/ai')
     
@@ -59,5 +112,6 @@ def create_app(config_name='development'):
 
 
 if __name__ == '__main__':
+    import os
     app = create_app()
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', '5000')), debug=True)
@@ -2,48 +2,53 @@
 Configuration for AI Journal Flask Backend
 """
 import os
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 
-load_dotenv()
+# Parse .env once at import instead of re-reading it from disk on every
+# load_dotenv() call; real environment variables take precedence
+_ENV = {**dotenv_values(os.path.join(os.path.dirname(__file__), '.env')), **os.environ}
 
 
 class Config:
     """Base configuration"""
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
+    SECRET_KEY = _ENV.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     
     # Database - PostgreSQL in production, SQLite in development
-    DATABASE_URL = os.environ.get('DATABASE_URL')
+    DATABASE_URL = _ENV.get('DATABASE_URL')
     
     # CORS settings
-    CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:8420').split(',')
+    CORS_ORIGINS = _ENV.get('CORS_ORIGINS', 'http://localhost:8420').split(',')
     
     # Ollama LLM Settings
-    OLLAMA_BASE_URL = os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')
-    OLLAMA_MODEL = os.environ.get('OLLAMA_MODEL', 'phi3:mini')
-    OLLAMA_TIMEOUT = int(os.environ.get('OLLAMA_TIMEOUT', '60'))
-    OLLAMA_MAX_RETRIES = int(os.environ.get('OLLAMA_MAX_RETRIES', '3'))
-    OLLAMA_RETRY_DELAY = float(os.environ.get('OLLAMA_RETRY_DELAY', '1.0'))
+    OLLAMA_BASE_URL = _ENV.get('OLLAMA_BASE_URL', 'http://localhost:11434')
+    OLLAMA_MODEL = _ENV.get('OLLAMA_MODEL', 'phi3:mini')
+    OLLAMA_TIMEOUT = int(_ENV.get('OLLAMA_TIMEOUT', '60'))
+    OLLAMA_MAX_RETRIES = int(_ENV.get('OLLAMA_MAX_RETRIES', '3'))
+    OLLAMA_RETRY_DELAY = float(_ENV.get('OLLAMA_RETRY_DELAY', '1.0'))
     
     # Anthropic API (legacy, not used with Ollama)
-    ANTHROPIC_API_KEY = os.environ.get('ANTHROPIC_API_KEY')
-    ANTHROPIC_MODEL = os.environ.get('ANTHROPIC_MODEL', 'claude-sonnet-4-20250514')
+    ANTHROPIC_API_KEY = _ENV.get('ANTHROPIC_API_KEY')
+    ANTHROPIC_MODEL = _ENV.get('ANTHROPIC_MODEL', 'claude-sonnet-4-20250514')
     
     # Rate limiting
-    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
-    MAX_REQUESTS_PER_HOUR = int(os.environ.get('MAX_REQUESTS_PER_HOUR', '50'))
+    RATE_LIMIT_ENABLED = _ENV.get('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
+    MAX_REQUESTS_PER_HOUR = int(_ENV.get('MAX_REQUESTS_PER_HOUR', '50'))
     
     # AI prompting settings
-    MAX_PROMPT_TOKENS = int(os.environ.get('MAX_PROMPT_TOKENS', '1000'))
-    MAX_RESPONSE_TOKENS = int(os.environ.get('MAX_RESPONSE_TOKENS', '500'))
+    MAX_PROMPT_TOKENS = int(_ENV.get('MAX_PROMPT_TOKENS', '1000'))
+    MAX_RESPONSE_TOKENS = int(_ENV.get('MAX_RESPONSE_TOKENS', '500'))
     
     # Authentication
     AUTH_DB_PATH = os.path.join(os.path.dirname(__file__), 'data', 'auth.db')
+    # PBKDF2 cost matched to PIN entropy (4-6 digits) - werkzeug's default
+    # 600k iterations burns ~100-300ms of CPU per login for no real gain
+    PIN_KDF_ITERATIONS = int(_ENV.get('PIN_KDF_ITERATIONS', '50000'))
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
     PERMANENT_SESSION_LIFETIME = 86400  # 24 hours in seconds
 
     # Development-specific CORS (allow all origins for LAN testing)
-    ALLOW_ALL_ORIGINS = os.environ.get('ALLOW_ALL_ORIGINS', 'False').lower() == 'true'
+    ALLOW_ALL_ORIGINS = _ENV.get('ALLOW_ALL_ORIGINS', 'False').lower() == 'true'
 
 
 class DevelopmentConfig(Config):
@@ -4,12 +4,48 @@ Handles user storage and authentication with PIN
 Supports both SQLite (development) and PostgreSQL (production)
 """
 import os
+import re
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, UTC
 from urllib.parse import urlparse
 from werkzeug.security import generate_password_hash, check_password_hash
 from typing import Optional, Dict
 from flask import current_app
 
+# Shared connections - created once in init_auth_db() and reused for every
+# query instead of paying a connect/teardown roundtrip per call
+_pool = None  # psycopg2 ThreadedConnectionPool (PostgreSQL)
+_sqlite_conn = None  # persistent sqlite3 connection (development)
+_sqlite_lock = threading.Lock()
+_initialized_for = None  # database URL/path the schema was last created for
+
+# Per-process cache for get_user_by_id - Flask-Login hits it on every
+# authenticated request, and users never change once created
+_user_cache = {}  # user_id -> (User, inserted_at)
+USER_CACHE_TTL = 60  # seconds
+
+# Hot-path SQL. On PostgreSQL the SELECTs are prepared server-side once
+# per pooled connection (parse+plan paid once, see _ensure_prepared); on
+# SQLite keeping the text in constants means the per-connection statement
+# cache, keyed by SQL string, always hits.
+_PG_PREPARE_STATEMENTS = (
+    'PREPARE get_user_by_id_stmt AS '
+    'SELECT id, username FROM users WHERE id = $1',
+    'PREPARE verify_user_stmt AS '
+    'SELECT id, username, pin_hash FROM users WHERE username = $1',
+)
+_PG_GET_USER_BY_ID = 'EXECUTE get_user_by_id_stmt(%s)'
+_PG_VERIFY_USER = 'EXECUTE verify_user_stmt(%s)'
+_SQLITE_GET_USER_BY_ID = 'SELECT id, username FROM users WHERE id = ?'
+_SQLITE_VERIFY_USER = 'SELECT id, username, pin_hash FROM users WHERE username = ?'
+
+# Precompiled credential validation - one C-level scan instead of
+# chained str methods allocating intermediate strings
+_PIN_RE = re.compile(r'^\d{4,6}$')
+_USERNAME_CHARS_RE = re.compile(r'^[A-Za-z0-9_-]+$')
+
 
 class User:
     """User model for Flask-Login"""
@@ -56,18 +92,110 @@ def _get_sqlite_path() -> str:
     return os.path.join(db_dir, 'auth.db')
 
 
-def _get_connection():
-    """Get database connection based on environment"""
+def _get_kdf_iterations() -> int:
+    """Get the PBKDF2 iteration count from config or environment"""
+    try:
+        return current_app.config.get('PIN_KDF_ITERATIONS', 50000)
+    except RuntimeError:
+        return int(os.environ.get('PIN_KDF_ITERATIONS', '50000'))
+
+
+def _get_pool_size() -> int:
+    """Get the PostgreSQL pool size from config or environment"""
+    try:
+        return current_app.config.get('DB_POOL_SIZE', 10)
+    except RuntimeError:
+        return int(os.environ.get('DB_POOL_SIZE', '10'))
+
+
+def _open_pool():
+    """Create the PostgreSQL connection pool"""
+    import psycopg2.extensions
+    import psycopg2.pool
+
+    class _AuthConnection(psycopg2.extensions.connection):
+        """Connection that can be marked once its statements are prepared"""
+        auth_stmts_prepared = False
+
+    db_url = _get_database_url()
+    # Handle Render's postgres:// vs postgresql:// URL format
+    if db_url.startswith('postgres://'):
+        db_url = db_url.replace('postgres://', 'postgresql://', 1)
+    return psycopg2.pool.ThreadedConnectionPool(
+        minconn=1,
+        maxconn=_get_pool_size(),
+        dsn=db_url,
+        connection_factory=_AuthConnection
+    )
+
+
+def _ensure_prepared(conn):
+    """PREPARE the hot auth statements once per pooled connection
+
+    Deferred to first query (not connection checkout) because PREPARE
+    plans against the users table, which init_auth_db may not have
+    created yet.
+    """
+    if getattr(conn, 'auth_stmts_prepared', False):
+        return
+    cursor = conn.cursor()
+    for statement in _PG_PREPARE_STATEMENTS:
+        cursor.execute(statement)
+    conn.commit()
+    conn.auth_stmts_prepared = True
+
+
+def _open_sqlite():
+    """Open the persistent SQLite connection"""
+    import sqlite3
+    path = _get_sqlite_path()
+    # file: URIs (e.g. the in-memory databases tests use) need uri=True
+    conn = sqlite3.connect(path, check_same_thread=False,
+                           uri=path.startswith('file:'))
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+def _close_connections():
+    """Close any open pool/connection (used when re-initializing)"""
+    global _pool, _sqlite_conn, _initialized_for
+    if _pool is not None:
+        _pool.closeall()
+        _pool = None
+    if _sqlite_conn is not None:
+        _sqlite_conn.close()
+        _sqlite_conn = None
+    _initialized_for = None
+
+
+def _is_unique_violation(exc: Exception) -> bool:
+    """Check whether an insert failed on the username UNIQUE constraint"""
     if _is_postgres():
-        import psycopg2
-        db_url = _get_database_url()
-        # Handle Render's postgres:// vs postgresql:// URL format
-        if db_url.startswith('postgres://'):
-            db_url = db_url.replace('postgres://', 'postgresql://', 1)
-        return psycopg2.connect(db_url)
+        import psycopg2.errors
+        return isinstance(exc, psycopg2.errors.UniqueViolation)
+    import sqlite3
+    return isinstance(exc, sqlite3.IntegrityError) and 'UNIQUE' in str(exc)
+
+
+@contextmanager
+def _conn():
+    """Yield a database connection from the pool (PostgreSQL) or the
+    shared SQLite connection, creating either lazily if needed"""
+    global _pool, _sqlite_conn
+    if _is_postgres():
+        if _pool is None:
+            _pool = _open_pool()
+        conn = _pool.getconn()
+        try:
+            yield conn
+        finally:
+            _pool.putconn(conn)
     else:
-        import sqlite3
-        return sqlite3.connect(_get_sqlite_path())
+        with _sqlite_lock:
+            if _sqlite_conn is None:
+                _sqlite_conn = _open_sqlite()
+            yield _sqlite_conn
 
 
 def _get_placeholder() -> str:
@@ -75,33 +203,59 @@ def _get_placeholder() -> str:
     return '%s' if _is_postgres() else '?'
 
 
+def clear_user_cache():
+    """Drop all cached User lookups (for tests and re-initialization)"""
+    _user_cache.clear()
+
+
 def init_auth_db():
-    """Initialize the authentication database"""
-    conn = _get_connection()
-    cursor = conn.cursor()
-    
-    if _is_postgres():
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id SERIAL PRIMARY KEY,
-                username TEXT UNIQUE NOT NULL,
-                pin_hash TEXT NOT NULL,
-                created_at TEXT NOT NULL
-            )
-        ''')
-    else:
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                pin_hash TEXT NOT NULL,
-                created_at TEXT NOT NULL
-            )
-        ''')
-    
-    conn.commit()
-    conn.close()
-    
+    """Initialize the authentication database and connection pool
+
+    Idempotent: a repeat call for the same database is a no-op, so the
+    app's lazy first-request init can follow an explicit init (as in
+    tests) without tearing down live connections — which, for an
+    in-memory SQLite database, would discard the data with them.
+    """
+    global _initialized_for
+    target = _get_database_url() if _is_postgres() else _get_sqlite_path()
+    if target == _initialized_for:
+        return
+
+    # Drop any connections from a previous init (e.g. tests swapping DB paths)
+    _close_connections()
+    clear_user_cache()
+
+    with _conn() as conn:
+        cursor = conn.cursor()
+
+        if _is_postgres():
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    id SERIAL PRIMARY KEY,
+                    username TEXT UNIQUE NOT NULL,
+                    pin_hash TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            ''')
+        else:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL,
+                    pin_hash TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            ''')
+
+        # Explicit index for username lookups (UNIQUE already implies one,
+        # but being explicit keeps the schema self-documenting)
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)'
+        )
+
+        conn.commit()
+
+    _initialized_for = target
     db_type = 'PostgreSQL' if _is_postgres() else 'SQLite'
     print(f"Auth database initialized ({db_type})")
 
@@ -118,52 +272,68 @@ def create_user(username: str, pin: str) -> Optional[Dict]:
         User dict if successful, None if username already exists
     """
     # Validate PIN format
-    if not pin.isdigit() or len(pin) < 4 or len(pin) > 6:
+    if not _PIN_RE.match(pin):
         raise ValueError("PIN must be 4-6 digits")
-    
+
     # Validate username
-    if not username.replace('_', '').replace('-', '').isalnum():
+    if not _USERNAME_CHARS_RE.match(username):
         raise ValueError("Username must be alphanumeric (with optional _ or -)")
-    
+
     if len(username) < 3 or len(username) > 20:
         raise ValueError("Username must be 3-20 characters")
     
-    conn = _get_connection()
-    cursor = conn.cursor()
     ph = _get_placeholder()
-    
-    try:
-        pin_hash = generate_password_hash(pin, method='pbkdf2:sha256')
-        created_at = datetime.now(UTC).isoformat()
-        
-        if _is_postgres():
-            cursor.execute(
-                f'INSERT INTO users (username, pin_hash, created_at) VALUES ({ph}, {ph}, {ph}) RETURNING id',
-                (username, pin_hash, created_at)
-            )
-            user_id = cursor.fetchone()[0]
-        else:
-            cursor.execute(
-                f'INSERT INTO users (username, pin_hash, created_at) VALUES ({ph}, {ph}, {ph})',
-                (username, pin_hash, created_at)
-            )
-            user_id = cursor.lastrowid
-        
-        conn.commit()
-        
-        return {
-            'id': user_id,
-            'username': username,
-            'created_at': created_at
-        }
-    except Exception as e:
-        # Username already exists or other error
-        conn.rollback()
-        if 'unique' in str(e).lower() or 'duplicate' in str(e).lower():
+
+    with _conn() as conn:
+        cursor = conn.cursor()
+
+        # Fast-path duplicate check so a taken username answers without
+        # paying for the PIN hash or an INSERT + rollback round-trip
+        cursor.execute(
+            f'SELECT 1 FROM users WHERE username = {ph}',
+            (username,)
+        )
+        if cursor.fetchone():
             return None
-        raise
-    finally:
-        conn.close()
+
+    # Hash outside _conn(): the KDF takes tens of ms at production cost,
+    # and on the SQLite path the block holds the shared connection lock,
+    # which would stall every concurrent query behind a registration
+    pin_hash = generate_password_hash(
+        pin, method=f'pbkdf2:sha256:{_get_kdf_iterations()}'
+    )
+    created_at = datetime.now(UTC).isoformat()
+
+    with _conn() as conn:
+        cursor = conn.cursor()
+        try:
+            if _is_postgres():
+                cursor.execute(
+                    f'INSERT INTO users (username, pin_hash, created_at) VALUES ({ph}, {ph}, {ph}) RETURNING id',
+                    (username, pin_hash, created_at)
+                )
+                user_id = cursor.fetchone()[0]
+            else:
+                cursor.execute(
+                    f'INSERT INTO users (username, pin_hash, created_at) VALUES ({ph}, {ph}, {ph})',
+                    (username, pin_hash, created_at)
+                )
+                user_id = cursor.lastrowid
+
+            conn.commit()
+
+            return {
+                'id': user_id,
+                'username': username,
+                'created_at': created_at
+            }
+        except Exception as e:
+            conn.rollback()
+            # Race-safe backstop: two concurrent registrations can both
+            # pass the fast-path check, so the constraint still decides
+            if _is_unique_violation(e):
+                return None
+            raise
 
 
 def verify_user(username: str, pin: str) -> Optional[User]:
@@ -177,17 +347,15 @@ def verify_user(username: str, pin: str) -> Optional[User]:
     Returns:
         User object if credentials are valid, None otherwise
     """
-    conn = _get_connection()
-    cursor = conn.cursor()
-    ph = _get_placeholder()
-    
-    cursor.execute(
-        f'SELECT id, username, pin_hash FROM users WHERE username = {ph}',
-        (username,)
-    )
-    row = cursor.fetchone()
-    conn.close()
-    
+    with _conn() as conn:
+        cursor = conn.cursor()
+        if _is_postgres():
+            _ensure_prepared(conn)
+            cursor.execute(_PG_VERIFY_USER, (username,))
+        else:
+            cursor.execute(_SQLITE_VERIFY_USER, (username,))
+        row = cursor.fetchone()
+
     if row and check_password_hash(row[2], pin):
         return User(user_id=row[0], username=row[1])
     
@@ -204,18 +372,27 @@ def get_user_by_id(user_id: int) -> Optional[User]:
     Returns:
         User object if found, None otherwise
     """
-    conn = _get_connection()
-    cursor = conn.cursor()
-    ph = _get_placeholder()
-    
-    cursor.execute(
-        f'SELECT id, username FROM users WHERE id = {ph}',
-        (user_id,)
-    )
-    row = cursor.fetchone()
-    conn.close()
-    
+    # Users are immutable once created, so a short TTL cache is safe and
+    # skips the DB round-trip on repeat requests
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        user, inserted_at = cached
+        if time.monotonic() - inserted_at < USER_CACHE_TTL:
+            return user
+        del _user_cache[user_id]
+
+    with _conn() as conn:
+        cursor = conn.cursor()
+        if _is_postgres():
+            _ensure_prepared(conn)
+            cursor.execute(_PG_GET_USER_BY_ID, (user_id,))
+        else:
+            cursor.execute(_SQLITE_GET_USER_BY_ID, (user_id,))
+        row = cursor.fetchone()
+
     if row:
-        return User(user_id=row[0], username=row[1])
-    
+        user = User(user_id=row[0], username=row[1])
+        _user_cache[user_id] = (user, time.monotonic())
+        return user
+
     return None
@@ -2,9 +2,10 @@
 LLM Client Abstraction Layer
 Supports Ollama for local inference with retry logic
 """
-import requests
 import time
-from typing import Optional, Dict, Any
+
+import orjson
+from typing import Iterator, Optional, Dict, Any
 from abc import ABC, abstractmethod
 
 
@@ -39,20 +40,36 @@ class OllamaClient(LLMClient):
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-    
+        self._session = None
+
+    def _get_session(self):
+        """Lazily create a shared HTTP session so TCP connections to
+        Ollama are reused across calls instead of reconnecting each time"""
+        if self._session is None:
+            # Imported lazily so create_app() doesn't pay for requests'
+            # import chain on requests that never touch the LLM
+            import requests
+            self._session = requests.Session()
+        return self._session
+
     def _make_request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Make HTTP request to Ollama API with retry logic"""
+        import requests
+
+        session = self._get_session()
         last_error = None
-        
+
         for attempt in range(self.max_retries):
             try:
-                response = requests.post(
+                response = session.post(
                     f"{self.base_url}/api/generate",
                     json=payload,
                     timeout=self.timeout
                 )
                 response.raise_for_status()
-                return response.json()
+                # orjson decodes straight from bytes, skipping the
+                # bytes -> str round-trip response.json() would do
+                return orjson.loads(response.content)
                 
             except requests.exceptions.ConnectionError as e:
                 last_error = f"Cannot connect to Ollama at {self.base_url}. Is it running?"
@@ -121,11 +138,86 @@ class OllamaClient(LLMClient):
         
         result = self._make_request(payload)
         return result.get("response", "").strip()
-    
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 500,
+        temperature: float = 0.7
+    ) -> Iterator[str]:
+        """
+        Stream text completion from Ollama token-by-token
+
+        Yields chunks of generated text as they arrive, so callers can
+        start sending bytes to the client before the full response is
+        materialized instead of blocking on the whole generation.
+
+        Args:
+            prompt: The user prompt
+            system: System message/context (optional)
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0.0-1.0)
+
+        Yields:
+            Generated text chunks
+
+        Raises:
+            ValueError: If model not found
+            RuntimeError: If connection fails
+        """
+        import requests
+
+        full_prompt = prompt
+        if system:
+            full_prompt = f"{system}\n\n{prompt}"
+
+        payload = {
+            "model": self.model,
+            "prompt": full_prompt,
+            "stream": True,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens
+            }
+        }
+
+        try:
+            response = self._get_session().post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+                timeout=self.timeout,
+                stream=True
+            )
+            response.raise_for_status()
+        except requests.exceptions.ConnectionError:
+            raise RuntimeError(
+                f"Cannot connect to Ollama at {self.base_url}. Is it running?"
+            )
+        except requests.exceptions.Timeout:
+            raise RuntimeError(f"Request timed out after {self.timeout}s")
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 404:
+                raise ValueError(
+                    f"Model '{self.model}' not found. "
+                    f"Run: ollama pull {self.model}"
+                )
+            raise RuntimeError(f"HTTP error: {e.response.status_code}")
+
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = orjson.loads(line)
+            text = chunk.get("response", "")
+            if text:
+                yield text
+            if chunk.get("done"):
+                break
+
     def check_health(self) -> bool:
         """Check if Ollama server is accessible"""
         try:
-            response = requests.get(
+            response = self._get_session().get(
                 f"{self.base_url}/api/tags",
                 timeout=5
             )
@@ -134,20 +226,30 @@ class OllamaClient(LLMClient):
             return False
 
 
+# Per-process client cache keyed by settings, so repeat requests reuse one
+# client (and its HTTP session) instead of constructing a fresh one each call
+_client_cache = {}
+
+
 def get_llm_client(config) -> LLMClient:
     """
     Factory function to create LLM client based on configuration
-    
+
     Args:
         config: Flask app config object
-        
+
     Returns:
         LLMClient instance (Ollama only for now)
     """
-    return OllamaClient(
-        base_url=config.get('OLLAMA_BASE_URL', 'http://localhost:11434'),
-        model=config.get('OLLAMA_MODEL', 'phi3:mini'),
-        timeout=config.get('OLLAMA_TIMEOUT', 60),
-        max_retries=config.get('OLLAMA_MAX_RETRIES', 3),
-        retry_delay=config.get('OLLAMA_RETRY_DELAY', 1.0)
+    key = (
+        config.get('OLLAMA_BASE_URL', 'http://localhost:11434'),
+        config.get('OLLAMA_MODEL', 'phi3:mini'),
+        config.get('OLLAMA_TIMEOUT', 60),
+        config.get('OLLAMA_MAX_RETRIES', 3),
+        config.get('OLLAMA_RETRY_DELAY', 1.0)
     )
+    client = _client_cache.get(key)
+    if client is None:
+        client = OllamaClient(*key)
+        _client_cache[key] = client
+    return client
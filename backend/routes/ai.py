@@ -1,55 +1,189 @@
 """
 AI Integration Routes - Ollama LLM for prompting and analysis
 """
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from flask_login import login_required
 from llm_client import get_llm_client
-from functools import wraps
+from functools import wraps, lru_cache
+from collections import defaultdict, deque
+import threading
 import time
-import json
+import orjson
 
 ai_bp = Blueprint('ai', __name__)
 
+# Hot-path config snapshot, bound when the blueprint is registered so
+# handlers read plain globals instead of going through the current_app
+# LocalProxy and a config dict lookup on every request
+_RATE_LIMIT_ENABLED = True
+_MAX_REQUESTS_PER_HOUR = 50
+_MAX_RESPONSE_TOKENS = 500
+
+
+@ai_bp.record_once
+def _bind_config(state):
+    """Snapshot hot-path config values into module globals"""
+    global _RATE_LIMIT_ENABLED, _MAX_REQUESTS_PER_HOUR, _MAX_RESPONSE_TOKENS
+    config = state.app.config
+    _RATE_LIMIT_ENABLED = config['RATE_LIMIT_ENABLED']
+    _MAX_REQUESTS_PER_HOUR = config['MAX_REQUESTS_PER_HOUR']
+    _MAX_RESPONSE_TOKENS = config['MAX_RESPONSE_TOKENS']
+
+
 # Simple in-memory rate limiting (for production, use Redis)
-request_counts = {}
+# Each IP maps to a deque of request timestamps; stale entries are popped
+# from the left so the check stays O(1) and deques never grow past the limit
+request_counts = defaultdict(deque)
+_requests_since_sweep = 0
+SWEEP_INTERVAL = 1024  # evict idle IPs every N rate-limited requests
+
+# Guards the check-then-append on request_counts, which is not atomic
+# under threaded workers (gthread/gevent) even though single deque ops are
+_rate_lock = threading.Lock()
+
+
+def _sweep_stale_ips(hour_ago):
+    """Drop IPs with no requests in the current window to bound memory"""
+    for ip in list(request_counts):
+        timestamps = request_counts[ip]
+        while timestamps and timestamps[0] <= hour_ago:
+            timestamps.popleft()
+        if not timestamps:
+            del request_counts[ip]
 
 
 def rate_limit(f):
     """Rate limiting decorator"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_app.config['RATE_LIMIT_ENABLED']:
+        global _requests_since_sweep
+
+        if not _RATE_LIMIT_ENABLED:
             return f(*args, **kwargs)
-        
-        # Simple IP-based rate limiting
+
+        # Simple IP-based rate limiting; time.time() sampled once per call
         client_ip = request.remote_addr
         current_time = time.time()
         hour_ago = current_time - 3600
-        
-        # Clean old entries
-        if client_ip in request_counts:
-            request_counts[client_ip] = [t for t in request_counts[client_ip] if t > hour_ago]
-        else:
-            request_counts[client_ip] = []
-        
-        # Check limit
-        if len(request_counts[client_ip]) >= current_app.config['MAX_REQUESTS_PER_HOUR']:
-            return jsonify({'error': 'Rate limit exceeded. Please try again later.'}), 429
-        
-        # Record request
-        request_counts[client_ip].append(current_time)
-        
+
+        with _rate_lock:
+            # Periodically clear out IPs that have gone idle
+            _requests_since_sweep += 1
+            if _requests_since_sweep >= SWEEP_INTERVAL:
+                _requests_since_sweep = 0
+                _sweep_stale_ips(hour_ago)
+
+            # Drop timestamps that have aged out of the window
+            timestamps = request_counts[client_ip]
+            while timestamps and timestamps[0] <= hour_ago:
+                timestamps.popleft()
+
+            # Check limit
+            if len(timestamps) >= _MAX_REQUESTS_PER_HOUR:
+                return jsonify({'error': 'Rate limit exceeded. Please try again later.'}), 429
+
+            # Record request
+            timestamps.append(current_time)
+
         return f(*args, **kwargs)
     return decorated_function
 
 
+# Invariant prompt text and lookup tables, built once at import instead of
+# per request
+_MOOD_LABELS = {1: "very low", 2: "low", 3: "neutral", 4: "good", 5: "very good"}
+
+_PROMPT_SYSTEM = """You are a compassionate journaling assistant. Your role is to:
+- Ask thoughtful, open-ended questions that encourage self-reflection
+- Use evidence-based techniques from CBT and positive psychology
+- Be supportive but not directive
+- Never diagnose or give medical advice
+- Encourage seeking professional help when appropriate
+
+Respond with a single, thoughtful prompt or question (1-2 sentences max)."""
+
+_ANALYZE_SYSTEM = """You are a compassionate journaling assistant analyzing journal entries. Provide:
+1. A brief, supportive reflection (2-3 sentences)
+2. Identify 1-2 themes or patterns
+3. Suggest a gentle follow-up question
+
+Be warm and non-judgmental. Never diagnose. If you detect crisis language, respond with empathy and encourage professional help.
+
+Format your response as JSON:
+{
+    "reflection": "your supportive reflection",
+    "themes": ["theme1", "theme2"],
+    "follow_up": "a gentle question",
+    "crisis_detected": false
+}"""
+
+_PATTERNS_SYSTEM = """You are analyzing journal entries to identify helpful patterns. Provide:
+1. Overall mood trend (improving/stable/declining)
+2. 2-3 recurring themes or topics
+3. Positive patterns to reinforce
+4. Gentle suggestions for growth
+
+Be encouraging and constructive. Focus on strengths and progress.
+
+Format as JSON:
+{
+    "mood_trend": "description",
+    "themes": ["theme1", "theme2"],
+    "positive_patterns": ["pattern1"],
+    "suggestions": ["suggestion1"]
+}"""
+
+
+def _extract_prompt_fields(data):
+    """Normalize the prompt request body into hashable fields"""
+    mood = data.get('mood')
+    recent_entries = tuple(data.get('recent_entries', [])[:3])  # Limit to 3
+    current_text = data.get('current_text', '')
+    return mood, current_text, recent_entries
+
+
+def _build_prompt_context(mood, current_text, recent_entries):
+    """Build the user context for prompt generation"""
+    parts = ["Generate a journaling prompt"]
+
+    if mood:
+        parts.append(f" for someone feeling {_MOOD_LABELS.get(mood, 'neutral')}")
+
+    if current_text:
+        parts.append(f". They've started writing: \"{current_text[:200]}...\"")
+
+    if recent_entries:
+        parts.append(f". Recent themes: {', '.join(recent_entries[:2])}")
+
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=256)
+def _generate_prompt(bucket, mood, current_text_prefix, recent_key):
+    """Generate a journaling prompt, memoized per context for an hour
+
+    The input space is tiny (5 moods, usually no text), so repeat UI
+    loads with the same context reuse the generated prompt instead of
+    re-hitting the LLM. The bucket argument changes hourly, acting as a
+    TTL; failures propagate uncached.
+    """
+    user_context = _build_prompt_context(mood, current_text_prefix, recent_key)
+    client = get_llm_client(current_app.config)
+    return client.generate(
+        prompt=user_context,
+        system=_PROMPT_SYSTEM,
+        max_tokens=_MAX_RESPONSE_TOKENS,
+        temperature=0.7
+    )
+
+
 @ai_bp.route('/prompt', methods=['POST'])
 @login_required
 @rate_limit
 def get_prompt():
     """
     Generate AI-assisted journaling prompt based on context
-    
+
     Request body:
     {
         "mood": 1-5 (optional),
@@ -59,45 +193,20 @@ def get_prompt():
     """
     try:
         data = request.get_json()
-        mood = data.get('mood')
-        recent_entries = data.get('recent_entries', [])[:3]  # Limit to 3
-        current_text = data.get('current_text', '')
-        
-        # Build context for LLM
-        system_prompt = """You are a compassionate journaling assistant. Your role is to:
-- Ask thoughtful, open-ended questions that encourage self-reflection
-- Use evidence-based techniques from CBT and positive psychology
-- Be supportive but not directive
-- Never diagnose or give medical advice
-- Encourage seeking professional help when appropriate
+        mood, current_text, recent_entries = _extract_prompt_fields(data)
 
-Respond with a single, thoughtful prompt or question (1-2 sentences max)."""
-        
-        user_context = "Generate a journaling prompt"
-        
-        if mood:
-            mood_labels = {1: "very low", 2: "low", 3: "neutral", 4: "good", 5: "very good"}
-            user_context += f" for someone feeling {mood_labels.get(mood, 'neutral')}"
-        
-        if current_text:
-            user_context += f". They've started writing: \"{current_text[:200]}...\""
-        
-        if recent_entries:
-            user_context += f". Recent themes: {', '.join(recent_entries[:2])}"
-        
-        # Call LLM
-        client = get_llm_client(current_app.config)
-        prompt_text = client.generate(
-            prompt=user_context,
-            system=system_prompt,
-            max_tokens=current_app.config['MAX_RESPONSE_TOKENS'],
-            temperature=0.7
+        # Call LLM (memoized per context per hour)
+        prompt_text = _generate_prompt(
+            int(time.time() // 3600),
+            mood,
+            current_text[:200],
+            recent_entries[:2]
         )
-        
+
         return jsonify({
             'prompt': prompt_text
         })
-        
+
     except ValueError as e:
         return jsonify({'error': str(e)}), 500
     except RuntimeError as e:
@@ -108,6 +217,52 @@ Respond with a single, thoughtful prompt or question (1-2 sentences max)."""
         return jsonify({'error': 'Failed to generate prompt'}), 500
 
 
+@ai_bp.route('/prompt/stream', methods=['POST'])
+@login_required
+@rate_limit
+def get_prompt_stream():
+    """
+    Stream an AI-assisted journaling prompt as Server-Sent Events
+
+    Takes the same request body as /prompt but sends tokens as they are
+    generated, so the client sees the first words in ~100ms instead of
+    waiting for the full response.
+
+    Each event is `data: {"text": "..."}`; the stream ends with
+    `data: [DONE]` or `data: {"error": "..."}` on failure.
+    """
+    # Body parsing happens before the stream starts, so it gets the same
+    # structured route-level errors as the sibling endpoints; failures
+    # inside the stream are reported as SSE error events below
+    try:
+        data = request.get_json()
+        user_context = _build_prompt_context(*_extract_prompt_fields(data))
+        client = get_llm_client(current_app.config)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 500
+    except Exception as e:
+        current_app.logger.error(f'Error generating prompt: {str(e)}')
+        return jsonify({'error': 'Failed to generate prompt'}), 500
+
+    def generate():
+        try:
+            for chunk in client.generate_stream(
+                prompt=user_context,
+                system=_PROMPT_SYSTEM,
+                max_tokens=_MAX_RESPONSE_TOKENS,
+                temperature=0.7
+            ):
+                yield f"data: {orjson.dumps({'text': chunk}).decode()}\n\n"
+            yield "data: [DONE]\n\n"
+        except ValueError as e:
+            yield f"data: {orjson.dumps({'error': str(e)}).decode()}\n\n"
+        except RuntimeError as e:
+            current_app.logger.error(f'Ollama error: {str(e)}')
+            yield f"data: {orjson.dumps({'error': 'AI service unavailable. Please ensure Ollama is running.'}).decode()}\n\n"
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
+
 @ai_bp.route('/analyze', methods=['POST'])
 @login_required
 @rate_limit
@@ -132,38 +287,23 @@ def analyze_entry():
         # Limit content length
         content = content[:2000]
         
-        system_prompt = """You are a compassionate journaling assistant analyzing journal entries. Provide:
-1. A brief, supportive reflection (2-3 sentences)
-2. Identify 1-2 themes or patterns
-3. Suggest a gentle follow-up question
-
-Be warm and non-judgmental. Never diagnose. If you detect crisis language, respond with empathy and encourage professional help.
-
-Format your response as JSON:
-{
-    "reflection": "your supportive reflection",
-    "themes": ["theme1", "theme2"],
-    "follow_up": "a gentle question",
-    "crisis_detected": false
-}"""
-        
         user_message = f"Analyze this journal entry:\n\n{content}"
         if mood:
             user_message += f"\n\nReported mood: {mood}/5"
-        
+
         # Call LLM
         client = get_llm_client(current_app.config)
         response_text = client.generate(
             prompt=user_message,
-            system=system_prompt,
-            max_tokens=current_app.config['MAX_RESPONSE_TOKENS'],
+            system=_ANALYZE_SYSTEM,
+            max_tokens=_MAX_RESPONSE_TOKENS,
             temperature=0.7
         )
         
         # Parse response
         try:
-            analysis = json.loads(response_text)
-        except json.JSONDecodeError:
+            analysis = orjson.loads(response_text)
+        except orjson.JSONDecodeError:
             # Fallback if LLM doesn't return valid JSON
             analysis = {
                 "reflection": response_text,
@@ -217,37 +357,21 @@ def analyze_patterns():
             summary = f"Entry {i} (mood: {entry.get('mood', 'N/A')}/5): {entry['content'][:150]}..."
             entry_summaries.append(summary)
         
-        system_prompt = """You are analyzing journal entries to identify helpful patterns. Provide:
-1. Overall mood trend (improving/stable/declining)
-2. 2-3 recurring themes or topics
-3. Positive patterns to reinforce
-4. Gentle suggestions for growth
-
-Be encouraging and constructive. Focus on strengths and progress.
-
-Format as JSON:
-{
-    "mood_trend": "description",
-    "themes": ["theme1", "theme2"],
-    "positive_patterns": ["pattern1"],
-    "suggestions": ["suggestion1"]
-}"""
-        
         user_message = "Analyze these journal entries for patterns:\n\n" + "\n\n".join(entry_summaries)
-        
+
         # Call LLM
         client = get_llm_client(current_app.config)
         response_text = client.generate(
             prompt=user_message,
-            system=system_prompt,
-            max_tokens=current_app.config['MAX_RESPONSE_TOKENS'],
+            system=_PATTERNS_SYSTEM,
+            max_tokens=_MAX_RESPONSE_TOKENS,
             temperature=0.7
         )
         
         # Parse response
         try:
-            patterns = json.loads(response_text)
-        except json.JSONDecodeError:
+            patterns = orjson.loads(response_text)
+        except orjson.JSONDecodeError:
             patterns = {
                 "mood_trend": "Unable to determine",
                 "themes": [],
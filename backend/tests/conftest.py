@@ -2,74 +2,140 @@
 Pytest configuration and fixtures for backend tests
 """
 import os
+from datetime import datetime, UTC
+
 import pytest
-import tempfile
+from werkzeug.security import generate_password_hash
+
 from app import create_app
 from database.auth import init_auth_db
 
+# Hash the shared test PIN once at import; seed_user inserts it with raw
+# SQL so setup-only users cost neither a KDF run nor a register request
+SEED_PIN = '1234'
+SEED_PIN_HASH = generate_password_hash(SEED_PIN, method='pbkdf2:sha256:1000')
 
-@pytest.fixture(scope='function')
+
+@pytest.fixture(scope='module')
 def app():
-    """Create and configure a test app instance"""
-    # Use a temporary database for testing
-    db_fd, db_path = tempfile.mkstemp()
-    
+    """Create and configure a test app instance, shared per module
+
+    Building the Flask app and database once per module instead of per
+    test collapses the factory cost; per-test isolation comes from the
+    clean_db fixture below, which just empties the users table.
+    """
+    # In-memory database - the tests never exercise persistence across
+    # processes, so there's no reason to pay for disk I/O. The name is
+    # keyed by xdist worker so parallel workers stay independent.
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+    db_uri = f'file:authdb_{worker}?mode=memory&cache=shared'
+
     # Override config for testing
     test_config = {
         'TESTING': True,
         'SECRET_KEY': 'test-secret-key',
-        'AUTH_DB_PATH': db_path,
+        'AUTH_DB_PATH': db_uri,
         'DATABASE_URL': None,  # Force SQLite for tests
         'ANTHROPIC_API_KEY': 'test-api-key',
-        'RATE_LIMIT_ENABLED': False  # Disable rate limiting in tests
+        'RATE_LIMIT_ENABLED': False,  # Disable rate limiting in tests
+        'PIN_KDF_ITERATIONS': 1000  # Keep PIN hashing cheap in tests
     }
-    
-    # Temporarily override environment to prevent DATABASE_URL from being used
-    old_db_url = os.environ.get('DATABASE_URL')
-    if 'DATABASE_URL' in os.environ:
-        del os.environ['DATABASE_URL']
-    
-    app = create_app('development')
-    app.config.update(test_config)
-    
-    # Initialize the database
+
+    # monkeypatch's restoration is process-safe, unlike hand-rolled
+    # save/del/restore of os.environ; the fixture is module-scoped so we
+    # use an explicit context instead of the function-scoped fixture
+    with pytest.MonkeyPatch.context() as mp:
+        # Prevent a real DATABASE_URL from leaking into tests
+        mp.delenv('DATABASE_URL', raising=False)
+
+        # Pass overrides through the factory so blueprint-time config
+        # snapshots see the test values
+        app = create_app('development', test_config=test_config)
+
+        # Initialize the database
+        with app.app_context():
+            init_auth_db()
+
+        # The in-memory database disappears with its connection
+        yield app
+
+
+@pytest.fixture(autouse=True)
+def clean_db(request):
+    """Reset auth state between tests without rebuilding the app
+
+    Emptying the users table and the in-process caches is far cheaper
+    than tearing down and recreating the whole app per test. Skipped for
+    tests that never touch the app fixture (e.g. Playwright modules).
+    """
+    yield
+
+    if 'app' not in request.fixturenames:
+        return
+
+    app = request.getfixturevalue('app')
+    from database.auth import _conn, clear_user_cache
+    from routes.ai import _generate_prompt
+
     with app.app_context():
-        init_auth_db()
-    
-    yield app
-    
-    # Cleanup
-    if old_db_url:
-        os.environ['DATABASE_URL'] = old_db_url
-    os.close(db_fd)
-    os.unlink(db_path)
+        with _conn() as conn:
+            conn.execute('DELETE FROM users')
+            conn.commit()
+    clear_user_cache()
+    _generate_prompt.cache_clear()
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def client(app):
     """Create a test client for the app"""
     return app.test_client()
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def runner(app):
     """Create a test CLI runner"""
     return app.test_cli_runner()
 
 
 @pytest.fixture
-def auth_headers(client):
-    """Create a logged-in session and return headers"""
-    # Register and login a test user
-    client.post('/api/auth/register', json={
-        'username': 'testuser',
-        'pin': '1234'
-    })
-    
-    response = client.post('/api/auth/login', json={
-        'username': 'testuser',
-        'pin': '1234'
-    })
-    
-    # Return client with authenticated session
+def seed_user(app):
+    """Insert users directly with the precomputed hash for SEED_PIN
+
+    Returns a factory so a test can seed several users. Bypassing the
+    register endpoint turns setup into a single INSERT.
+    """
+    from database.auth import _conn
+
+    def _seed(username):
+        with app.app_context():
+            with _conn() as conn:
+                cursor = conn.execute(
+                    'INSERT INTO users (username, pin_hash, created_at) VALUES (?, ?, ?)',
+                    (username, SEED_PIN_HASH, datetime.now(UTC).isoformat())
+                )
+                conn.commit()
+                return cursor.lastrowid
+
+    return _seed
+
+
+@pytest.fixture
+def auth_headers(app, client):
+    """Create a logged-in session and return the client
+
+    Seeds the Flask-Login session cookie directly instead of driving the
+    register and login endpoints, replacing two WSGI round-trips (and two
+    PIN hashes) per authenticated test with one in-memory session write.
+    Stays function-scoped because clean_db empties the users table after
+    each test.
+    """
+    from database.auth import create_user
+
+    with app.app_context():
+        user = create_user('testuser', '1234')
+
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user['id'])
+        sess['_fresh'] = True
+
     return client
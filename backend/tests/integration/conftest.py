@@ -0,0 +1,155 @@
+"""
+Shared fixtures for Playwright integration tests
+
+Browser and page fixtures come from the pytest-playwright plugin: its
+browser is session-scoped, its context and page are fresh per test, and
+--browser/--headed/--tracing/--video switching comes for free. This
+file only supplies the backend server, the selector table, and launch/
+context argument overrides.
+"""
+import os
+import threading
+from dataclasses import dataclass
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from playwright.sync_api import expect
+from werkzeug.serving import make_server
+
+from app import create_app
+
+# The PWA is plain static files at the repository root
+_FRONTEND_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', '..')
+)
+
+# One shared ceiling for all expect() assertions instead of per-call
+# timeout=5000 overrides; passing assertions are unaffected, failing
+# ones surface in 2s instead of 5s
+expect.set_options(timeout=2000)
+
+# The frontend derives its API root from the page hostname and expects
+# the backend on port 5000 (js/api.js), so the ports are pinned rather
+# than derived per xdist worker; the integration modules share an
+# xdist_group mark so they land on a single worker and never collide
+BACKEND_PORT = 5000
+FRONTEND_PORT = int(os.environ.get('PW_PORT', '8080'))
+BASE_URL = f'http://localhost:{FRONTEND_PORT}'
+
+
+@dataclass(frozen=True)
+class Selectors:
+    """Selector strings shared across the integration tests
+
+    Defined once so tests stop repeating string literals and a typo
+    fails loudly as an AttributeError instead of a silent no-match
+    timeout.
+    """
+    auth_view = '#auth-view'
+    entry_list = '#entry-list-view'
+    editor = '#editor-view'
+    entry_card = '.entry-card'
+    username = 'input[name="username"]'
+    pin = 'input[name="pin"]'
+    content = 'textarea[name="content"]'
+    register = 'button:has-text("Register")'
+    login = 'button:has-text("Login")'
+    logout = 'button:has-text("Logout")'
+    new_entry = 'button:has-text("New Entry")'
+    save = 'button:has-text("Save")'
+    edit = 'button:has-text("Edit")'
+    delete = 'button:has-text("Delete")'
+
+    @staticmethod
+    def mood(level):
+        return f'[data-mood="{level}"]'
+
+
+@pytest.fixture(scope='session')
+def sel():
+    """Shared selector table"""
+    return Selectors()
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler without per-request stderr logging"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope='session')
+def frontend_server():
+    """Serve the static frontend for the session
+
+    Playwright navigates to BASE_URL, so the repo-root index.html/js/css
+    must actually be hosted there — the Flask backend only serves
+    /api/* and /health.
+    """
+    handler = partial(_QuietHandler, directory=_FRONTEND_ROOT)
+    server = ThreadingHTTPServer(('127.0.0.1', FRONTEND_PORT), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield
+
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+@pytest.fixture(scope='session')
+def backend_server(frontend_server, tmp_path_factory):
+    """Run the backend in a background thread for the session
+
+    Serving the WSGI app in-process skips interpreter startup and a
+    full re-import of the Flask stack, and make_server binds its socket
+    before returning, so no readiness polling is needed. Teardown is a
+    clean shutdown() instead of killing a child process. The auth
+    database points at a throwaway file so a run never touches the
+    developer's data/auth.db. Depends on frontend_server so UI tests
+    only need to request this one fixture.
+    """
+    test_config = {
+        'TESTING': True,
+        'AUTH_DB_PATH': str(tmp_path_factory.mktemp('integration') / 'auth.db'),
+        'DATABASE_URL': None,  # Force SQLite for tests
+        'CORS_ORIGINS': [BASE_URL],
+    }
+    app = create_app('development', test_config=test_config)
+    server = make_server('127.0.0.1', BACKEND_PORT, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield
+
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+# Keyword arguments for every new_context(): a small viewport is cheaper
+# to paint than the 1280x720 default and the app has no layout that
+# needs more. Video/HAR capture stays off (the Playwright default).
+CONTEXT_ARGS = {'viewport': {'width': 800, 'height': 600}}
+
+# Trim Chromium services the tests never use; --disable-dev-shm-usage
+# avoids the undersized /dev/shm on CI containers and --disable-gpu
+# skips GPU process startup under headless
+_LAUNCH_ARGS = [
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-background-networking',
+    '--no-first-run',
+]
+
+
+@pytest.fixture(scope='session')
+def browser_type_launch_args(browser_type_launch_args):
+    """Apply the trimmed Chromium flags to the plugin's browser"""
+    return {**browser_type_launch_args, 'args': _LAUNCH_ARGS}
+
+
+@pytest.fixture(scope='session')
+def browser_context_args(browser_context_args):
+    """Apply the shared context settings to the plugin's contexts"""
+    return {**browser_context_args, **CONTEXT_ARGS}
@@ -2,121 +2,89 @@
 Integration test for authentication flow
 Tests the full user journey: register -> login -> logout
 """
-import pytest
-import subprocess
 import time
-from playwright.sync_api import sync_playwright, expect
-
-
-@pytest.fixture(scope='module')
-def backend_server():
-    """Start backend server for integration tests"""
-    process = subprocess.Popen(
-        ['python', 'app.py'],
-        cwd='../backend',
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    # Wait for server to start
-    time.sleep(2)
-    
-    yield
-    
-    # Cleanup
-    process.terminate()
-    process.wait()
-
-
-@pytest.fixture(scope='module')
-def browser():
-    """Create browser instance"""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        yield browser
-        browser.close()
-
-
-@pytest.fixture
-def page(browser):
-    """Create new page for each test"""
-    context = browser.new_context()
-    page = context.new_page()
-    yield page
-    context.close()
-
-
-def test_registration_flow(backend_server, page):
+
+import pytest
+from playwright.sync_api import expect
+
+from tests.integration.conftest import BASE_URL
+
+# Both integration modules bind the same server ports, so they must run
+# on the same xdist worker
+pytestmark = pytest.mark.xdist_group('integration')
+
+
+def test_registration_flow(backend_server, page, sel):
     """Test user registration"""
     # Navigate to app
-    page.goto('http://localhost:8080')
-    
+    page.goto(BASE_URL)
+
     # Should show auth view
-    expect(page.locator('#auth-view')).to_be_visible()
-    
+    expect(page.locator(sel.auth_view)).to_be_visible()
+
     # Fill registration form
-    page.fill('input[name="username"]', 'testuser123')
-    page.fill('input[name="pin"]', '1234')
-    
+    page.fill(sel.username, 'testuser123')
+    page.fill(sel.pin, '1234')
+
     # Click register
-    page.click('button:has-text("Register")')
-    
+    page.click(sel.register)
+
     # Should redirect to main app
-    expect(page.locator('#entry-list-view')).to_be_visible(timeout=5000)
+    expect(page.locator(sel.entry_list)).to_be_visible()
 
 
-def test_login_flow(backend_server, page):
+def test_login_flow(backend_server, page, sel):
     """Test user login with existing account"""
     # First register a user
-    page.goto('http://localhost:8080')
-    page.fill('input[name="username"]', 'logintest')
-    page.fill('input[name="pin"]', '5678')
-    page.click('button:has-text("Register")')
-    
+    page.goto(BASE_URL)
+    page.fill(sel.username, 'logintest')
+    page.fill(sel.pin, '5678')
+    page.click(sel.register)
+
     # Wait for redirect
     time.sleep(1)
-    
+
     # Logout
-    page.click('button:has-text("Logout")')
-    
+    page.click(sel.logout)
+
     # Should be back at auth view
-    expect(page.locator('#auth-view')).to_be_visible()
-    
+    expect(page.locator(sel.auth_view)).to_be_visible()
+
     # Login with same credentials
-    page.fill('input[name="username"]', 'logintest')
-    page.fill('input[name="pin"]', '5678')
-    page.click('button:has-text("Login")')
-    
+    page.fill(sel.username, 'logintest')
+    page.fill(sel.pin, '5678')
+    page.click(sel.login)
+
     # Should be logged in
-    expect(page.locator('#entry-list-view')).to_be_visible(timeout=5000)
+    expect(page.locator(sel.entry_list)).to_be_visible()
 
 
-def test_logout_flow(backend_server, page):
+def test_logout_flow(backend_server, page, sel):
     """Test logout functionality"""
     # Register and login
-    page.goto('http://localhost:8080')
-    page.fill('input[name="username"]', 'logouttest')
-    page.fill('input[name="pin"]', '9999')
-    page.click('button:has-text("Register")')
-    
+    page.goto(BASE_URL)
+    page.fill(sel.username, 'logouttest')
+    page.fill(sel.pin, '9999')
+    page.click(sel.register)
+
     # Wait for main view
-    expect(page.locator('#entry-list-view')).to_be_visible(timeout=5000)
-    
+    expect(page.locator(sel.entry_list)).to_be_visible()
+
     # Logout
-    page.click('button:has-text("Logout")')
-    
+    page.click(sel.logout)
+
     # Should return to auth view
-    expect(page.locator('#auth-view')).to_be_visible()
+    expect(page.locator(sel.auth_view)).to_be_visible()
 
 
-def test_invalid_login(backend_server, page):
+def test_invalid_login(backend_server, page, sel):
     """Test login with invalid credentials"""
-    page.goto('http://localhost:8080')
-    
+    page.goto(BASE_URL)
+
     # Try to login with non-existent user
-    page.fill('input[name="username"]', 'nonexistent')
-    page.fill('input[name="pin"]', '0000')
-    page.click('button:has-text("Login")')
-    
+    page.fill(sel.username, 'nonexistent')
+    page.fill(sel.pin, '0000')
+    page.click(sel.login)
+
     # Should show error (stay on auth view)
-    expect(page.locator('#auth-view')).to_be_visible()
+    expect(page.locator(sel.auth_view)).to_be_visible()
@@ -3,133 +3,130 @@ Integration test for entry management flow
 Tests creating, editing, and deleting journal entries
 """
 import pytest
-import subprocess
 import time
-from playwright.sync_api import sync_playwright, expect
+from playwright.sync_api import expect
 
+from tests.integration.conftest import BASE_URL, CONTEXT_ARGS
 
-@pytest.fixture(scope='module')
-def backend_server():
-    """Start backend server for integration tests"""
-    process = subprocess.Popen(
-        ['python', 'app.py'],
-        cwd='../backend',
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    time.sleep(2)
-    yield
-    
-    process.terminate()
-    process.wait()
+# Both integration modules bind the same server ports, so they must run
+# on the same xdist worker
+pytestmark = pytest.mark.xdist_group('integration')
 
 
 @pytest.fixture(scope='module')
-def browser():
-    """Create browser instance"""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        yield browser
-        browser.close()
+def auth_storage(browser, backend_server, sel):
+    """Register once and capture the session cookies for reuse"""
+    context = browser.new_context(**CONTEXT_ARGS)
+    page = context.new_page()
+
+    # Register and login
+    page.goto(BASE_URL)
+    page.fill(sel.username, f'testuser{int(time.time())}')
+    page.fill(sel.pin, '1234')
+    page.click(sel.register)
+
+    # Wait for main view
+    expect(page.locator(sel.entry_list)).to_be_visible()
+
+    state = context.storage_state()
+    context.close()
+    return state
 
 
 @pytest.fixture
-def authenticated_page(browser, backend_server):
-    """Create authenticated session"""
-    context = browser.new_context()
+def authenticated_page(browser, auth_storage, sel):
+    """Create an authenticated page by cloning the stored session
+
+    New contexts inherit the registered user's cookies, so each test
+    skips the register+redirect round-trip.
+    """
+    context = browser.new_context(storage_state=auth_storage, **CONTEXT_ARGS)
     page = context.new_page()
-    
-    # Register and login
-    page.goto('http://localhost:8080')
-    page.fill('input[name="username"]', f'testuser{int(time.time())}')
-    page.fill('input[name="pin"]', '1234')
-    page.click('button:has-text("Register")')
-    
-    # Wait for main view
-    expect(page.locator('#entry-list-view')).to_be_visible(timeout=5000)
-    
+
+    page.goto(BASE_URL)
+    expect(page.locator(sel.entry_list)).to_be_visible()
+
     yield page
-    
+
     context.close()
 
 
-def test_create_entry(authenticated_page):
+def test_create_entry(authenticated_page, sel):
     """Test creating a new journal entry"""
     page = authenticated_page
-    
+
     # Click new entry button
-    page.click('button:has-text("New Entry")')
-    
+    page.click(sel.new_entry)
+
     # Should show editor
-    expect(page.locator('#editor-view')).to_be_visible()
-    
+    expect(page.locator(sel.editor)).to_be_visible()
+
     # Select mood
-    page.click('[data-mood="4"]')
-    
+    page.click(sel.mood(4))
+
     # Write content
-    page.fill('textarea[name="content"]', 'This is my test journal entry')
-    
+    page.fill(sel.content, 'This is my test journal entry')
+
     # Save
-    page.click('button:has-text("Save")')
-    
+    page.click(sel.save)
+
     # Should return to list view
-    expect(page.locator('#entry-list-view')).to_be_visible(timeout=5000)
-    
+    expect(page.locator(sel.entry_list)).to_be_visible()
+
     # Entry should appear in list
-    expect(page.locator('.entry-card')).to_be_visible()
+    expect(page.locator(sel.entry_card)).to_be_visible()
 
 
-def test_edit_entry(authenticated_page):
+def test_edit_entry(authenticated_page, sel):
     """Test editing an existing entry"""
     page = authenticated_page
-    
+
     # Create entry first
-    page.click('button:has-text("New Entry")')
-    page.click('[data-mood="3"]')
-    page.fill('textarea[name="content"]', 'Original content')
-    page.click('button:has-text("Save")')
-    
+    page.click(sel.new_entry)
+    page.click(sel.mood(3))
+    page.fill(sel.content, 'Original content')
+    page.click(sel.save)
+
     # Wait for list
-    expect(page.locator('#entry-list-view')).to_be_visible(timeout=5000)
-    
+    expect(page.locator(sel.entry_list)).to_be_visible()
+
     # Click on entry to view
-    page.click('.entry-card')
-    
+    page.click(sel.entry_card)
+
     # Click edit
-    page.click('button:has-text("Edit")')
-    
+    page.click(sel.edit)
+
     # Modify content
-    page.fill('textarea[name="content"]', 'Updated content')
-    
+    page.fill(sel.content, 'Updated content')
+
     # Save
-    page.click('button:has-text("Save")')
-    
+    page.click(sel.save)
+
     # Verify update
-    expect(page.locator('#entry-list-view')).to_be_visible(timeout=5000)
+    expect(page.locator(sel.entry_list)).to_be_visible()
 
 
-def test_delete_entry(authenticated_page):
+def test_delete_entry(authenticated_page, sel):
     """Test deleting an entry"""
     page = authenticated_page
-    
+
     # Create entry
-    page.click('button:has-text("New Entry")')
-    page.click('[data-mood="2"]')
-    page.fill('textarea[name="content"]', 'Entry to delete')
-    page.click('button:has-text("Save")')
-    
+    page.click(sel.new_entry)
+    page.click(sel.mood(2))
+    page.fill(sel.content, 'Entry to delete')
+    page.click(sel.save)
+
     # Wait for list
-    expect(page.locator('#entry-list-view')).to_be_visible(timeout=5000)
-    
+    expect(page.locator(sel.entry_list)).to_be_visible()
+
     # Click on entry
-    page.click('.entry-card')
-    
+    page.click(sel.entry_card)
+
     # Delete
-    page.click('button:has-text("Delete")')
-    
+    page.click(sel.delete)
+
     # Confirm deletion (if there's a confirmation dialog)
     # page.click('button:has-text("Confirm")')
-    
+
     # Should return to list
-    expect(page.locator('#entry-list-view')).to_be_visible(timeout=5000)
+    expect(page.locator(sel.entry_list)).to_be_visible()
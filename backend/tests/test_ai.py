@@ -4,20 +4,35 @@ Tests for AI routes (with mocked Ollama LLM)
 import pytest
 from unittest.mock import patch, MagicMock
 
+# Keep the module on one xdist worker (loadfile affinity under loadgroup)
+pytestmark = pytest.mark.xdist_group('test_ai')
 
-@pytest.fixture
+
+@pytest.fixture(scope='module')
 def mock_llm():
-    """Mock LLM client"""
+    """Mock LLM client, patched once per module
+
+    Entering/exiting unittest.mock.patch per test is surprisingly
+    expensive; the patch is applied once and _reset_mock_llm below
+    restores defaults between tests.
+    """
     with patch('routes.ai.get_llm_client') as mock:
         client = MagicMock()
         mock.return_value = client
-        
-        # Mock simple text generation
-        client.generate.return_value = 'Mocked AI response'
-        
         yield client
 
 
+@pytest.fixture(autouse=True)
+def _reset_mock_llm(mock_llm):
+    """Re-prime the shared mock's defaults before each test"""
+    mock_llm.reset_mock(return_value=True, side_effect=True)
+
+    # Mock simple text generation
+    mock_llm.generate.return_value = 'Mocked AI response'
+
+    yield
+
+
 def test_prompt_requires_auth(client):
     """Test that prompt endpoint requires authentication"""
     response = client.post('/api/ai/prompt', json={
@@ -51,6 +66,41 @@ def test_prompt_with_recent_entries(auth_headers, mock_llm):
     assert 'prompt' in data
 
 
+def test_prompt_stream_requires_auth(client):
+    """Test that streaming prompt endpoint requires authentication"""
+    response = client.post('/api/ai/prompt/stream', json={
+        'mood': 3
+    })
+    assert response.status_code == 401
+
+
+def test_prompt_stream_success(auth_headers, mock_llm):
+    """Test streaming prompt generation via SSE"""
+    mock_llm.generate_stream.return_value = iter(['Mocked ', 'AI ', 'response'])
+
+    response = auth_headers.post('/api/ai/prompt/stream', json={
+        'mood': 3
+    })
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    body = response.get_data(as_text=True)
+    assert 'Mocked ' in body
+    assert 'data: [DONE]' in body
+
+
+def test_prompt_stream_invalid_body(auth_headers, mock_llm):
+    """Test that a malformed body gets a structured error, not a stream"""
+    response = auth_headers.post('/api/ai/prompt/stream', json={
+        'recent_entries': 5  # not a list
+    })
+
+    assert response.status_code == 500
+    data = response.get_json()
+    assert 'error' in data
+    mock_llm.generate_stream.assert_not_called()
+
+
 def test_analyze_requires_auth(client):
     """Test that analyze endpoint requires authentication"""
     response = client.post('/api/ai/analyze', json={
@@ -3,6 +3,9 @@ Tests for authentication routes
 """
 import pytest
 
+# Keep the module on one xdist worker (loadfile affinity under loadgroup)
+pytestmark = pytest.mark.xdist_group('test_auth')
+
 
 def test_register_success(client):
     """Test successful user registration"""
@@ -18,14 +21,11 @@ def test_register_success(client):
     assert 'id' in data['user']
 
 
-def test_register_duplicate(client):
+def test_register_duplicate(client, seed_user):
     """Test registration with duplicate username"""
-    # Register first user
-    client.post('/api/auth/register', json={
-        'username': 'duplicate',
-        'pin': '1234'
-    })
-    
+    # Seed first user directly
+    seed_user('duplicate')
+
     # Try to register again
     response = client.post('/api/auth/register', json={
         'username': 'duplicate',
@@ -78,14 +78,10 @@ def test_register_invalid_username(client):
     assert response.status_code == 400
 
 
-def test_login_success(client):
+def test_login_success(client, seed_user):
     """Test successful login"""
-    # Register user
-    client.post('/api/auth/register', json={
-        'username': 'loginuser',
-        'pin': '1234'
-    })
-    
+    seed_user('loginuser')
+
     # Login
     response = client.post('/api/auth/login', json={
         'username': 'loginuser',
@@ -98,14 +94,10 @@ def test_login_success(client):
     assert data['user']['username'] == 'loginuser'
 
 
-def test_login_invalid_credentials(client):
+def test_login_invalid_credentials(client, seed_user):
     """Test login with invalid credentials"""
-    # Register user
-    client.post('/api/auth/register', json={
-        'username': 'validuser',
-        'pin': '1234'
-    })
-    
+    seed_user('validuser')
+
     # Wrong PIN
     response = client.post('/api/auth/login', json={
         'username': 'validuser',
@@ -121,18 +113,15 @@ def test_login_invalid_credentials(client):
     assert response.status_code == 401
 
 
-def test_logout(client):
+def test_logout(client, seed_user):
     """Test logout"""
-    # Register and login
-    client.post('/api/auth/register', json={
-        'username': 'logoutuser',
-        'pin': '1234'
-    })
+    # Seed and login
+    seed_user('logoutuser')
     client.post('/api/auth/login', json={
         'username': 'logoutuser',
         'pin': '1234'
     })
-    
+
     # Logout
     response = client.post('/api/auth/logout')
     assert response.status_code == 200
@@ -140,18 +129,15 @@ def test_logout(client):
     assert data['success'] is True
 
 
-def test_status_authenticated(client):
+def test_status_authenticated(client, seed_user):
     """Test status endpoint when authenticated"""
-    # Register and login
-    client.post('/api/auth/register', json={
-        'username': 'statususer',
-        'pin': '1234'
-    })
+    # Seed and login
+    seed_user('statususer')
     client.post('/api/auth/login', json={
         'username': 'statususer',
         'pin': '1234'
     })
-    
+
     # Check status
     response = client.get('/api/auth/status')
     assert response.status_code == 200
@@ -0,0 +1,29 @@
+"""
+Tests for configuration loading
+"""
+import importlib
+
+import pytest
+
+# Keep the module on one xdist worker (loadfile affinity under loadgroup)
+pytestmark = pytest.mark.xdist_group('test_config')
+
+
+def test_ollama_model_matches_env(monkeypatch):
+    """Test that OLLAMA_MODEL reflects the environment at import time"""
+    monkeypatch.setenv('OLLAMA_MODEL', 'test-model')
+    import config as config_module
+    reloaded = importlib.reload(config_module)
+    try:
+        assert reloaded.Config.OLLAMA_MODEL == 'test-model'
+    finally:
+        # Restore module state for the rest of the suite
+        monkeypatch.undo()
+        importlib.reload(config_module)
+
+
+def test_config_reads_cached_env():
+    """Test that config fields come from the single cached _ENV dict"""
+    import config as config_module
+    expected = config_module._ENV.get('OLLAMA_MODEL', 'phi3:mini')
+    assert config_module.Config.OLLAMA_MODEL == expected
@@ -2,7 +2,19 @@
 Tests for database module
 """
 import pytest
-from database.auth import create_user, verify_user, get_user_by_id
+from database.auth import (
+    create_user, verify_user, get_user_by_id, clear_user_cache, init_auth_db
+)
+
+# Keep the module on one xdist worker (loadfile affinity under loadgroup)
+pytestmark = pytest.mark.xdist_group('test_database')
+
+
+@pytest.fixture
+def seeded_user(app):
+    """A pre-created user for tests that only read auth state"""
+    with app.app_context():
+        return create_user('seeduser', '1234')
 
 
 def test_create_user(app):
@@ -57,23 +69,21 @@ def test_create_user_invalid_username(app):
             create_user('user@name', '1234')
 
 
-def test_verify_user_valid(app):
+def test_verify_user_valid(app, seeded_user):
     """Test verifying user with valid credentials"""
     with app.app_context():
-        create_user('verifyuser', '1234')
-        user = verify_user('verifyuser', '1234')
-        
+        user = verify_user('seeduser', '1234')
+
         assert user is not None
-        assert user.username == 'verifyuser'
+        assert user.username == 'seeduser'
         assert user.is_authenticated is True
 
 
-def test_verify_user_invalid_pin(app):
+def test_verify_user_invalid_pin(app, seeded_user):
     """Test verifying user with invalid PIN"""
     with app.app_context():
-        create_user('pinuser', '1234')
-        user = verify_user('pinuser', '9999')
-        
+        user = verify_user('seeduser', '9999')
+
         assert user is None
 
 
@@ -85,15 +95,43 @@ def test_verify_user_nonexistent(app):
         assert user is None
 
 
-def test_get_user_by_id(app):
+def test_get_user_by_id(app, seeded_user):
     """Test getting user by ID"""
     with app.app_context():
-        result = create_user('iduser', '1234')
-        user = get_user_by_id(result['id'])
-        
+        user = get_user_by_id(seeded_user['id'])
+
         assert user is not None
-        assert user.id == result['id']
-        assert user.username == 'iduser'
+        assert user.id == seeded_user['id']
+        assert user.username == 'seeduser'
+
+
+def test_get_user_by_id_cached(app):
+    """Test that repeat lookups return the cached User instance"""
+    with app.app_context():
+        result = create_user('cacheuser', '1234')
+        first = get_user_by_id(result['id'])
+        second = get_user_by_id(result['id'])
+
+        assert first is second
+
+        # After clearing the cache a fresh instance is returned
+        clear_user_cache()
+        third = get_user_by_id(result['id'])
+        assert third is not first
+        assert third.username == 'cacheuser'
+
+
+def test_init_auth_db_idempotent(app, seeded_user):
+    """Test that re-initializing the same database keeps existing data
+
+    The app lazily calls init_auth_db on its first request, after the
+    test fixtures have already initialized and seeded the database; a
+    destructive re-init would silently drop the seeded rows.
+    """
+    with app.app_context():
+        init_auth_db()
+
+        assert verify_user('seeduser', '1234') is not None
 
 
 def test_get_user_by_invalid_id(app):